@@ -0,0 +1,14 @@
+"""
+Poetry build script. Compiles jmdict/xml/models.py with mypyc when mypy is
+installed in the build environment; otherwise the package is pure-Python.
+"""
+
+
+def build(setup_kwargs):
+    try:
+        from mypyc.build import mypycify
+    except ImportError:
+        return
+    setup_kwargs.update(
+        {"ext_modules": mypycify(["jmdict/xml/models.py"]), "zip_safe": False}
+    )
@@ -1,49 +1,355 @@
+import contextlib
+import functools
+import gc
+import os
+import pickle
 import re
+import sqlite3
 from pathlib import Path
-
-from bs4 import BeautifulSoup
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from .models import JMDict, EntryElement
 
+# Bump whenever the pickled entries/indexes change shape.
+CACHE_VERSION = 4
+
+_META = re.compile(r"[.^$*+?{}\[\]\\|()]")
+
+# search_text() field name -> full-text index column.
+_FTS_COLUMNS = {"kanji": "keb", "reading": "reb", "glossary": "gloss"}
+
+
+def _fts_terms(query: str) -> str:
+    """
+    Quote each whitespace-separated term of a plain query as an FTS5 string,
+    so punctuation (e.g. "black-ish", "white (colour)") isn't read as query
+    syntax. A trailing "*" is kept as a prefix search.
+    """
+    terms = []
+    for term in query.split():
+        prefix = term.endswith("*")
+        term = term.rstrip("*")
+        if term:
+            terms.append('"' + term.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+@functools.lru_cache(maxsize=2048)
+def _compile(pattern: str, flags: int = 0):
+    return re.compile(pattern, flags)
+
+
+@contextlib.contextmanager
+def _gc_paused():
+    """
+    Pause the cyclic garbage collector while building or pickling the entries;
+    the millions of (acyclic) objects otherwise trigger a collection pass
+    every few hundred allocations.
+    """
+    if not gc.isenabled():
+        yield
+        return
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.enable()
+
+
+def _unique(entries: Iterable[EntryElement]) -> List[EntryElement]:
+    """
+    Drop consecutive duplicates; tokens of an entry are always indexed next
+    to each other, so this is enough to return each entry once.
+    """
+    results: List[EntryElement] = []
+    for entry in entries:
+        if not results or results[-1] is not entry:
+            results.append(entry)
+    return results
+
 
 class JMDictEngine(object):
     """
-    Wrapper for JMDict-XML BeautifulSoup-query which can be used as a pseudo
-    search-engine.
+    Wrapper for the parsed JMDict-XML entries which can be used as a pseudo
+    search-engine. The kanji, reading and glossary values are indexed once
+    at load time.
+
+    Unless `cache` is disabled, the parsed entries and indexes are pickled to
+    a `<xml_dir>.cache` file, which is reused as long as the xml file's
+    mtime and size are unchanged. The same goes for the SQLite full-text
+    index (`<xml_dir>.db`) used by search_text(), which is built on its
+    first call.
     """
 
-    def __init__(self, xml_dir: str):
+    INDEXES = (
+        "_by_seq",
+        "_by_keb",
+        "_by_reb",
+        "_by_gloss",
+        "_keb_tokens",
+        "_reb_tokens",
+        "_gloss_tokens",
+        "_keb_lower",
+        "_reb_lower",
+        "_gloss_lower",
+    )
+
+    def __init__(self, xml_dir: str, workers: int = 1, cache: bool = True):
         self.xml_dir = Path(xml_dir).absolute()
-        with open(xml_dir, "r") as xml:
-            self.xml_soup = BeautifulSoup(xml.read(), "lxml")
+        self.cache_dir = self.xml_dir.with_name(self.xml_dir.name + ".cache")
+        self.db_dir = self.xml_dir.with_name(self.xml_dir.name + ".db")
+        self.cache = cache
+        self._fts: Optional[sqlite3.Connection] = None
+        with _gc_paused():
+            if cache and self._load_cache():
+                return
+            # Not lazy: pickling the cache builds every sub-element anyway.
+            self.entries = JMDict.from_xml(xml_dir, workers=workers, lazy=False).entries
+            self._build_indexes()
+            if cache:
+                self._dump_cache()
+
+    def _cache_key(self):
+        stat = os.stat(self.xml_dir)
+        return (CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+
+    def _load_cache(self) -> bool:
+        """
+        Load the entries and indexes from the cache file. Returns False if the
+        cache is missing, stale or unreadable.
+        """
+        try:
+            with open(self.cache_dir, "rb") as cache:
+                if pickle.load(cache) != self._cache_key():
+                    return False
+                self.entries, indexes = pickle.load(cache)
+        except Exception:
+            return False
+        for name in self.INDEXES:
+            setattr(self, name, indexes[name])
+        return True
+
+    def _dump_cache(self):
+        """
+        Write the entries and indexes to the cache file. Failing to write the
+        cache (e.g. read-only directory) is not an error.
+        """
+        indexes = {name: getattr(self, name) for name in self.INDEXES}
+        temp_dir = self.cache_dir.with_name(self.cache_dir.name + ".tmp")
+        try:
+            with open(temp_dir, "wb") as cache:
+                pickle.dump(self._cache_key(), cache, pickle.HIGHEST_PROTOCOL)
+                pickle.dump((self.entries, indexes), cache, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_dir, self.cache_dir)
+        except OSError:
+            pass
+
+    def _build_indexes(self) -> None:
+        self._by_seq: Dict[Optional[int], EntryElement] = {}
+        self._by_keb: Dict[str, List[EntryElement]] = {}
+        self._by_reb: Dict[str, List[EntryElement]] = {}
+        self._by_gloss: Dict[str, List[EntryElement]] = {}
+        self._keb_tokens: List[Tuple[str, EntryElement]] = []
+        self._reb_tokens: List[Tuple[str, EntryElement]] = []
+        self._gloss_tokens: List[Tuple[str, EntryElement]] = []
+        # The lowercased tokens are the entries' own lowercased values, in the
+        # same order as the tokens.
+        self._keb_lower: List[str] = []
+        self._reb_lower: List[str] = []
+        self._gloss_lower: List[str] = []
+        for entry in self.entries:
+            self._by_seq[entry.sequence] = entry
+            for kanji in entry._kanji_values:
+                self._add_token(self._by_keb, self._keb_tokens, kanji, entry)
+            for reading in entry._reading_values:
+                self._add_token(self._by_reb, self._reb_tokens, reading, entry)
+            for glossary in entry._gloss_values:
+                self._add_token(self._by_gloss, self._gloss_tokens, glossary, entry)
+            self._keb_lower.extend(entry._kanji_low)
+            self._reb_lower.extend(entry._reading_low)
+            self._gloss_lower.extend(entry._gloss_low)
+
+    def _open_fts(self) -> sqlite3.Connection:
+        """
+        Open the full-text index, (re)building it if it is missing or stale.
+        A file that can't be used (e.g. corrupt) is deleted and rebuilt; the
+        index is kept in memory if `cache` is disabled or the file can't be
+        written.
+        """
+        if self.cache:
+            for _ in range(2):
+                try:
+                    return self._connect_fts(str(self.db_dir))
+                except sqlite3.DatabaseError:
+                    try:
+                        os.remove(self.db_dir)
+                    except OSError:
+                        break
+        return self._connect_fts(":memory:")
+
+    def _connect_fts(self, database: str) -> sqlite3.Connection:
+        db = sqlite3.connect(database)
+        try:
+            key = db.execute("SELECT version, mtime_ns, size FROM meta").fetchone()
+        except sqlite3.DatabaseError:
+            key = None
+        if key != self._cache_key():
+            try:
+                self._build_fts(db)
+            except sqlite3.Error:
+                db.close()
+                raise
+        return db
+
+    def _build_fts(self, db: sqlite3.Connection) -> None:
+        db.executescript("""
+            DROP TABLE IF EXISTS meta;
+            DROP TABLE IF EXISTS entries;
+            CREATE VIRTUAL TABLE entries USING fts5(
+                seq UNINDEXED, keb, reb, gloss,
+                tokenize='unicode61 remove_diacritics 2'
+            );
+            CREATE TABLE meta(version, mtime_ns, size);
+            """)
+        rows = (
+            (
+                entry.sequence,
+                " ".join(entry._kanji_values),
+                " ".join(entry._reading_values),
+                " ".join(entry._gloss_values),
+            )
+            for entry in self.entries
+        )
+        # Written in one transaction; an interrupted build has no meta row
+        # and is simply rebuilt next time.
+        with db:
+            db.executemany("INSERT INTO entries VALUES (?, ?, ?, ?)", rows)
+            db.execute("INSERT INTO meta VALUES (?, ?, ?)", self._cache_key())
+
+    @staticmethod
+    def _add_token(index, tokens, token, entry):
+        bucket = index.setdefault(token, [])
+        if not bucket or bucket[-1] is not entry:
+            bucket.append(entry)
+        tokens.append((token, entry))
+
+    @staticmethod
+    def _search(index, tokens, tokens_lower, value, exact, case_sensitive):
+        if exact and case_sensitive:
+            return JMDict(list(index.get(value, [])))
+        if exact:
+            value = value.lower()
+            matches = (
+                entry
+                for token, (_, entry) in zip(tokens_lower, tokens)
+                if token == value
+            )
+        elif _META.search(value) is None:
+            # Literal pattern; plain substring checks are cheaper than regex.
+            if case_sensitive:
+                matches = (entry for token, entry in tokens if value in token)
+            else:
+                value = value.lower()
+                matches = (
+                    entry
+                    for token, (_, entry) in zip(tokens_lower, tokens)
+                    if value in token
+                )
+        else:
+            pattern = _compile(value, 0 if case_sensitive else re.IGNORECASE)
+            matches = (entry for token, entry in tokens if pattern.search(token))
+        return JMDict(_unique(matches))
 
     def all(self):
-        return JMDict.from_soup(self.xml_soup)
+        return JMDict(list(self.entries))
 
     def search_sequence(self, value: int):
-        results = []
-        value = str(value)
-        for ent_seq in self.xml_soup.find_all("ent_seq", text=re.compile(value)):
-            results.append(EntryElement(ent_seq.find_parent("entry")))
-        return JMDict(results)
-
-    def search_kanji(self, value: str):
-        results = []
-        for keb in self.xml_soup.find_all("keb", text=re.compile(value)):
-            results.append(EntryElement(keb.find_parent("entry")))
-        return JMDict(results)
-
-    def search_reading(self, value: str):
-        results = []
-        for reb in self.xml_soup.find_all("reb", text=re.compile(value)):
-            results.append(EntryElement(reb.find_parent("entry")))
-        return JMDict(results)
-
-    def search_glossary(self, value: str):
-        results = []
-        for gloss in self.xml_soup.find_all("gloss", text=re.compile(value)):
-            results.append(EntryElement(gloss.find_parent("entry")))
-        return JMDict(results)
+        entry = self._by_seq.get(int(value))
+        return JMDict([entry] if entry is not None else [])
+
+    def search_kanji(
+        self, value: str, exact: bool = False, case_sensitive: bool = True
+    ):
+        """
+        Search entries by kanji; `value` is a regex pattern unless `exact` is
+        set.
+        """
+        return self._search(
+            self._by_keb,
+            self._keb_tokens,
+            self._keb_lower,
+            value,
+            exact,
+            case_sensitive,
+        )
+
+    def search_reading(
+        self, value: str, exact: bool = False, case_sensitive: bool = True
+    ):
+        """
+        Search entries by reading; `value` is a regex pattern unless `exact`
+        is set.
+        """
+        return self._search(
+            self._by_reb,
+            self._reb_tokens,
+            self._reb_lower,
+            value,
+            exact,
+            case_sensitive,
+        )
+
+    def search_glossary(
+        self, value: str, exact: bool = False, case_sensitive: bool = True
+    ):
+        """
+        Search entries by glossary; `value` is a regex pattern unless `exact`
+        is set.
+        """
+        return self._search(
+            self._by_gloss,
+            self._gloss_tokens,
+            self._gloss_lower,
+            value,
+            exact,
+            case_sensitive,
+        )
+
+    def search_text(
+        self,
+        query: str,
+        field: Optional[str] = None,
+        limit: Optional[int] = None,
+        raw: bool = False,
+    ):
+        """
+        Full-text search, restricted to `field` ("kanji", "reading" or
+        "glossary") if given. Entries are ordered by relevance.
+
+        By default `query` is plain text: entries must contain every word,
+        and a trailing "*" makes a word a prefix search (e.g. "whi*"). With
+        `raw`, `query` is passed as an SQLite FTS5 query instead (e.g.
+        "white NOT black"); invalid syntax raises ValueError.
+        """
+        if field is not None and field not in _FTS_COLUMNS:
+            raise ValueError(f"Invalid field ({field}).")
+        if not raw:
+            query = _fts_terms(query)
+            if not query:
+                return JMDict([])
+        if self._fts is None:
+            self._fts = self._open_fts()
+        column = _FTS_COLUMNS[field] if field is not None else "entries"
+        try:
+            rows = self._fts.execute(
+                f"SELECT seq FROM entries WHERE {column} MATCH ? ORDER BY rank LIMIT ?",
+                (query, -1 if limit is None else limit),
+            ).fetchall()
+        except sqlite3.OperationalError as error:
+            if not raw:
+                raise
+            raise ValueError(f"Invalid full-text query ({query}): {error}")
+        return JMDict([self._by_seq[seq] for seq, in rows])
 
     def __repr__(self):
         return f"<JMDictEngine source: {self.xml_dir}>"
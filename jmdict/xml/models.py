@@ -1,65 +1,151 @@
-import io
+import bisect
+import itertools
+import os
+import sys
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
-from bs4 import BeautifulSoup
-from bs4.element import Tag
+from lxml import etree
+from lxml.etree import _Element as Element
+
+try:
+    import ahocorasick
+except ImportError:  # Optional; only speeds up JMDict.filter_any().
+    ahocorasick = None  # type: ignore
+
+try:
+    from mypy_extensions import trait
+except ImportError:  # Only needed when compiling this module with mypyc.
+
+    def trait(cls):  # type: ignore
+        return cls
+
+
+XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
+
+_TABS = tuple("\t" * i for i in range(16))
+
+
+def _tabs(level: int) -> str:
+    """
+    Return `level` tab characters; the common levels are precomputed.
+    """
+    return _TABS[level] if level < len(_TABS) else "\t" * level
+
+
+def _text(item: Element) -> str:
+    """
+    Return the text content of an element, including unresolved entity
+    references (e.g. `&n;`).
+    """
+    return "".join(item.itertext())
+
+
+def _lower(value: str) -> str:
+    """
+    Return the lowercased value, reusing `value` itself if it has no cased
+    characters (e.g. kana and kanji) instead of keeping an equal copy.
+    """
+    lowered = value.lower()
+    return value if lowered == value else lowered
+
+
+def _attrs(item: Element) -> Dict[str, str]:
+    """
+    Return the attributes present in the xml file; unlike `item.get()`,
+    iterating `attrib` skips DTD default values (e.g. `xml:lang="eng"`). The
+    values are interned since only a handful of them exist.
+    """
+    return {key: sys.intern(value) for key, value in item.attrib.items()}
+
+
+def _match_any(values: Sequence[str], value: str, exact: bool) -> bool:
+    """
+    Check if `value` equals (or is a substring of) any of `values`.
+    """
+    if exact:
+        return value in values
+    return any(value in val for val in values)
 
 
 class Entities(object):
     def __init__(self, xml_content: str):
-        self.items = {}
+        self.items: Dict[str, str] = {}
 
 
 class XmlElementDecorators(object):
     @classmethod
-    def verify_tag(cls, decorated):
+    def verify_tag(cls, decorated: Callable[..., Any]) -> Callable[..., Any]:
         """
-        Check if the provided bs4.element.Tag name and XmlElement object's tag name matches each other.
+        Check if the provided lxml element tag and XmlElement object's tag name matches each other.
         """
 
-        def wrapper(*args, **kwargs):
-            key_arg = len(args) == 1 and kwargs.get("item")
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key_arg = len(args) == 1 and "item" in kwargs
             positional = len(args) == 2
             if not (key_arg or positional):
                 raise ValueError("Invalid number of arguments.")
             obj = args[0]
             if key_arg:
                 tag = kwargs["item"]
-                if not tag:
+                if tag is None:
                     raise ValueError(
                         f"Received null input. Check the xml content/tag object for ({obj.tag}) element."
                     )
-                if obj.tag != tag.name:
-                    raise ValueError(f"Tag name mismatched ({obj.tag} != {tag.name})")
+                if obj.tag != tag.tag:
+                    raise ValueError(f"Tag name mismatched ({obj.tag} != {tag.tag})")
             else:
                 tag = args[1]
-                if not tag:
+                if tag is None:
                     raise ValueError(
                         f"Received null input. Check the xml content/tag object for ({obj.tag}) element."
                     )
-                if obj.tag != tag.name:
-                    raise ValueError(f"Tag name mismatched ({obj.tag} != {tag.name})")
+                if obj.tag != tag.tag:
+                    raise ValueError(f"Tag name mismatched ({obj.tag} != {tag.tag})")
             return decorated(*args, **kwargs)
 
         return wrapper
 
 
+@trait
 class MatchValueMixin(object):
     """
     Mixin for checking if the queried value matches the object. Assumes the
-    applied object has `value` attribute.
+    applied object has `value` and `_value_lower` (lowercased `value`)
+    attributes. It has to be listed after the XmlElement base.
     """
 
-    def match_value(self, value: str, exact: bool = True, case_sensitive: bool = True):
-        temp_val = self.value
-        if not case_sensitive:
+    __slots__ = ()
+
+    value: Optional[str]
+    _value_lower: Optional[str]
+
+    def match_value(
+        self, value: str, exact: bool = True, case_sensitive: bool = True
+    ) -> bool:
+        if case_sensitive:
+            temp_val = self.value
+        else:
             value = value.lower()
-            temp_val = temp_val.lower()
+            temp_val = self._value_lower
         if exact:
             return value == temp_val
         else:
-            return value in temp_val
+            return temp_val is not None and value in temp_val
 
 
 class XmlElement(ABC):
@@ -67,149 +153,202 @@ class XmlElement(ABC):
     Abstract class for JMDict xml elements (tested with Rev 1.0.9).
     """
 
-    version: str = "1.0.9"
-    tag: str = None
+    __slots__ = ()
+
+    version: ClassVar[str] = "1.0.9"
+    tag: ClassVar[Optional[str]] = None
 
     @abstractmethod
-    def update(self, item: Tag):
+    def update(self, item: Element) -> None:
         """
-        Update the element value with the provided Tag object.
+        Update the element value with the provided lxml element.
         """
         raise NotImplementedError
 
     @abstractmethod
-    def as_text(self, *args, **kwargs):
+    def as_text(self, *args: Any, **kwargs: Any) -> str:
         """
         Return a more detailed string-representation of the object.
         """
         raise NotImplementedError
 
-    def print_out(self, *args, **kwargs):
+    def print_out(self, *args: Any, **kwargs: Any) -> None:
         """
         Print as_text() output on the terminal.
         """
         print(self.as_text(*args, **kwargs))
 
-    def __repr__(self):
+    def __repr__(self) -> str:
         cls_name = type(self).__name__
         return f"<{cls_name}>"
 
 
-class KanjiElement(MatchValueMixin, XmlElement):
-    tag: str = "k_ele"
+class KanjiElement(XmlElement, MatchValueMixin):
+    tag: ClassVar[str] = "k_ele"
+    __slots__ = ("value", "_value_lower", "info", "priority")
 
-    def __init__(self, item: Tag = None):
-        self.value: str = None
+    def __init__(self, item: Optional[Element] = None) -> None:
+        self.value: Optional[str] = None
+        self._value_lower: Optional[str] = None
         self.info: List[str] = []
         self.priority: List[str] = []
-        if item:
+        if item is not None:
             self.update(item)
 
-    @XmlElementDecorators.verify_tag
-    def update(self, item: Tag):
-        self.value = item.keb.text
-        for info in item.find_all("ke_inf"):
-            self.info.append(info.text)
-        for priority in item.find_all("ke_pri"):
-            self.priority.append(priority.text)
-
-    def as_text(self):
+    def update(self, item: Element) -> None:
+        if __debug__ and item.tag != self.tag:
+            raise ValueError(f"Tag name mismatched ({self.tag} != {item.tag})")
+        code_children = {"ke_inf": self.info, "ke_pri": self.priority}
+        for child in item.iterchildren(tag=etree.Element):
+            if child.tag == "keb":
+                self.value = _text(child)
+                self._value_lower = _lower(self.value)
+            elif child.tag in code_children:
+                code_children[child.tag].append(sys.intern(_text(child)))
+
+    def as_text(self) -> str:
         return f"{self.value} (info: {self.info}, priority: {self.priority})"
 
-    def __str__(self):
-        return self.value
+    def __str__(self) -> str:
+        return self.value or ""
 
-    def __repr__(self):
+    def __repr__(self) -> str:
         cls_name = type(self).__name__
         return f"<{cls_name} Value: {self.value}>"
 
 
-class ReadingElement(MatchValueMixin, XmlElement):
-    tag: str = "r_ele"
+class ReadingElement(XmlElement, MatchValueMixin):
+    tag: ClassVar[str] = "r_ele"
+    __slots__ = ("value", "_value_lower", "no_kanji", "reading", "info", "priority")
 
-    def __init__(self, item: Tag = None):
-        self.value: str = None
-        self.no_kanji: str = None
+    def __init__(self, item: Optional[Element] = None) -> None:
+        self.value: Optional[str] = None
+        self._value_lower: Optional[str] = None
+        self.no_kanji: Optional[str] = None
         self.reading: List[str] = []
         self.info: List[str] = []
         self.priority: List[str] = []
-        if item:
+        if item is not None:
             self.update(item)
 
-    @XmlElementDecorators.verify_tag
-    def update(self, item: Tag):
-        self.value = item.reb.text
-        if item.re_nokanji:
-            self.no_kanji = item.re_nokanji.text
-        for reading in item.find_all("re_restr"):
-            self.reading.append(item.re_restr.text)
-        for info in item.find_all("re_inf"):
-            self.info.append(item.re_inf.text)
-        for priority in item.find_all("re_pri"):
-            self.priority.append(item.re_pri.text)
-
-    def as_text(self):
+    def update(self, item: Element) -> None:
+        if __debug__ and item.tag != self.tag:
+            raise ValueError(f"Tag name mismatched ({self.tag} != {item.tag})")
+        code_children = {"re_inf": self.info, "re_pri": self.priority}
+        for child in item.iterchildren(tag=etree.Element):
+            if child.tag == "reb":
+                self.value = _text(child)
+                self._value_lower = _lower(self.value)
+            elif child.tag == "re_nokanji":
+                self.no_kanji = _text(child)
+            elif child.tag in code_children:
+                code_children[child.tag].append(sys.intern(_text(child)))
+            elif child.tag == "re_restr":
+                self.reading.append(_text(child))
+
+    def as_text(self) -> str:
         return f"{self.value} (no_kanji: {self.no_kanji}, reading: {self.reading}, info: {self.info}, priority: {self.priority})"
 
-    def __str__(self):
-        return self.value
+    def __str__(self) -> str:
+        return self.value or ""
 
-    def __repr__(self):
+    def __repr__(self) -> str:
         cls_name = type(self).__name__
         return f"<{cls_name} Value: {self.value}>"
 
 
-class LanguageSourceElement(MatchValueMixin, XmlElement):
-    tag: str = "lsource"
+class LanguageSourceElement(XmlElement, MatchValueMixin):
+    tag: ClassVar[str] = "lsource"
+    __slots__ = ("value", "_value_lower", "lang", "ls_type", "ls_wasei")
 
-    def __init__(self, item: Tag = None):
-        self.value = None
-        self.attrs: Dict = {
-            "xml:lang": None,
-            "ls_type": None,
-            "ls_wasei": None,
-        }
-        if item:
+    def __init__(self, item: Optional[Element] = None) -> None:
+        self.value: Optional[str] = None
+        self._value_lower: Optional[str] = None
+        self.lang: Optional[str] = None
+        self.ls_type: Optional[str] = None
+        self.ls_wasei: Optional[str] = None
+        if item is not None:
             self.update(item)
 
-    def as_text(self):
-        return f"{self.value} (attrs: {self.attrs})"
-
-    @XmlElementDecorators.verify_tag
-    def update(self, item: Tag):
-        self.value = item.text
-        self.attrs.update(item.attrs)
-
+    @property
+    def attrs(self) -> Dict[str, Optional[str]]:
+        """
+        The xml attributes as a (newly built) dict.
+        """
+        return {
+            "xml:lang": self.lang,
+            "ls_type": self.ls_type,
+            "ls_wasei": self.ls_wasei,
+        }
 
-class GlossaryElement(MatchValueMixin, XmlElement):
-    tag: str = "gloss"
+    def as_text(self) -> str:
+        return f"{self.value} (attrs: {self.attrs})"
 
-    def __init__(self, item: Tag = None):
-        self.value = None
-        self.attrs: Dict = {
-            "xml:lang": None,
-            "g_type": None,
-            "g_gend": None,
-        }
-        if item:
+    def update(self, item: Element) -> None:
+        if __debug__ and item.tag != self.tag:
+            raise ValueError(f"Tag name mismatched ({self.tag} != {item.tag})")
+        self.value = _text(item)
+        self._value_lower = _lower(self.value)
+        attrs = _attrs(item)
+        self.lang = attrs.get(XML_LANG)
+        self.ls_type = attrs.get("ls_type")
+        self.ls_wasei = attrs.get("ls_wasei")
+
+
+class GlossaryElement(XmlElement, MatchValueMixin):
+    tag: ClassVar[str] = "gloss"
+    __slots__ = ("value", "_value_lower", "lang", "gtype", "ggend")
+
+    def __init__(self, item: Optional[Element] = None) -> None:
+        self.value: Optional[str] = None
+        self._value_lower: Optional[str] = None
+        self.lang: Optional[str] = None
+        self.gtype: Optional[str] = None
+        self.ggend: Optional[str] = None
+        if item is not None:
             self.update(item)
 
-    @XmlElementDecorators.verify_tag
-    def update(self, item: Tag):
-        self.attrs.update(item.attrs)
-        self.value = item.text
-
-    def as_text(self):
+    @property
+    def attrs(self) -> Dict[str, Optional[str]]:
+        """
+        The xml attributes as a (newly built) dict.
+        """
+        return {"xml:lang": self.lang, "g_type": self.gtype, "g_gend": self.ggend}
+
+    def update(self, item: Element) -> None:
+        if __debug__ and item.tag != self.tag:
+            raise ValueError(f"Tag name mismatched ({self.tag} != {item.tag})")
+        attrs = _attrs(item)
+        self.lang = attrs.get(XML_LANG)
+        self.gtype = attrs.get("g_type")
+        self.ggend = attrs.get("g_gend")
+        self.value = _text(item)
+        self._value_lower = _lower(self.value)
+
+    def as_text(self) -> str:
         return f"{self.value} (attrs: {self.attrs})"
 
-    def __str__(self):
-        return self.value
+    def __str__(self) -> str:
+        return self.value or ""
 
 
 class SenseElement(XmlElement):
-    tag: str = "sense"
+    tag: ClassVar[str] = "sense"
+    __slots__ = (
+        "kanji",
+        "reading",
+        "xref",
+        "antonym",
+        "part_of_speech",
+        "field",
+        "misc",
+        "info",
+        "dialect",
+        "language_src",
+        "glossary",
+    )
 
-    SUB_ELEMENTS = [
+    SUB_ELEMENTS: ClassVar[List[str]] = [
         "kanji",
         "reading",
         "xref",
@@ -222,225 +361,489 @@ class SenseElement(XmlElement):
         "language_src",
         "glossary",
     ]
-
-    def __init__(self, item: Tag = None):
+    # Sub-elements holding plain strings vs. XmlElements, so as_text() can
+    # pick the formatter once per list instead of once per value.
+    _STR_SUBS: ClassVar[FrozenSet[str]] = frozenset(
+        [
+            "kanji",
+            "reading",
+            "xref",
+            "antonym",
+            "part_of_speech",
+            "field",
+            "misc",
+            "info",
+            "dialect",
+        ]
+    )
+    _XML_SUBS: ClassVar[FrozenSet[str]] = frozenset(["language_src", "glossary"])
+
+    def __init__(self, item: Optional[Element] = None) -> None:
         self.kanji: List[str] = []
         self.reading: List[str] = []
         self.xref: List[str] = []
         self.antonym: List[str] = []
-        self.part_of_speech = []
+        self.part_of_speech: List[str] = []
         self.field: List[str] = []
         self.misc: List[str] = []
         self.info: List[str] = []
         self.dialect: List[str] = []
         self.language_src: List[LanguageSourceElement] = []
         self.glossary: List[GlossaryElement] = []
-        if item:
+        if item is not None:
             self.update(item)
 
-    @XmlElementDecorators.verify_tag
-    def update(self, item: Tag):
-        for kanji in item.find_all("stagk"):
-            self.kanji.append(kanji.text)
-        for reading in item.find_all("stagr"):
-            self.reading.append(reading.text)
-        for xref in item.find_all("xref"):
-            self.xref.append(xref.text)
-        for antonym in item.find_all("ant"):
-            self.antonym.append(antonym.text)
-        for pos in item.find_all("pos"):
-            self.part_of_speech.append(pos.text)
-        for field in item.find_all("field"):
-            self.field.append(field.text)
-        for misc in item.find_all("misc"):
-            self.misc.append(misc.text)
-        for info in item.find_all("s_inf"):
-            self.info.append(info.text)
-        for dialect in item.find_all("dial"):
-            self.dialect.append(dialect.text)
-        for lsource in item.find_all(LanguageSourceElement.tag):
-            self.language_src.append(LanguageSourceElement(lsource))
-        for glossary in item.find_all(GlossaryElement.tag):
-            self.glossary.append(GlossaryElement(glossary))
+    def update(self, item: Element) -> None:
+        if __debug__ and item.tag != self.tag:
+            raise ValueError(f"Tag name mismatched ({self.tag} != {item.tag})")
+        text_children = {
+            "stagk": self.kanji,
+            "stagr": self.reading,
+            "xref": self.xref,
+            "ant": self.antonym,
+            "s_inf": self.info,
+        }
+        # Codes repeated across the whole dictionary (e.g. &n;); interned.
+        code_children = {
+            "pos": self.part_of_speech,
+            "field": self.field,
+            "misc": self.misc,
+            "dial": self.dialect,
+        }
+        for child in item.iterchildren(tag=etree.Element):
+            if child.tag in code_children:
+                code_children[child.tag].append(sys.intern(_text(child)))
+            elif child.tag in text_children:
+                text_children[child.tag].append(_text(child))
+            elif child.tag == GlossaryElement.tag:
+                self.glossary.append(GlossaryElement(child))
+            elif child.tag == LanguageSourceElement.tag:
+                self.language_src.append(LanguageSourceElement(child))
 
     def as_text(
         self,
-        sub_elements: List[str] = None,
-        buffer: io.StringIO = None,
+        sub_elements: Optional[List[str]] = None,
+        parts: Optional[List[str]] = None,
         indent_level: int = 0,
-    ):
-        indentation = lambda x: "\t" * x
-        if not buffer:
-            buffer = io.StringIO()
+    ) -> str:
+        """
+        Return the formatted sub-elements. If `parts` is given, the lines are
+        appended to it and the whole list is joined.
+        """
+        if sub_elements is None:
+            sub_elements = self.SUB_ELEMENTS
+        if parts is None:
+            parts = []
+        self._write_text(parts, sub_elements, indent_level)
+        return "".join(parts)
+
+    def _write_text(
+        self, parts: List[str], sub_elements: List[str], indent_level: int
+    ) -> None:
+        tabs = _tabs(indent_level)
+        item_tabs = _tabs(indent_level + 1)
         for sub_el in sub_elements:
-            if hasattr(self, sub_el):
-                buffer.write(f"{indentation(indent_level)}.{sub_el}:\n")
-                for val in getattr(self, sub_el, []):
-                    if issubclass(type(val), XmlElement):
-                        buffer.write(
-                            f"{indentation(indent_level+1)}- {val.as_text()}\n"
-                        )
-                    else:
-                        buffer.write(f"{indentation(indent_level+1)}- {val}\n")
-        return buffer.getvalue()
-
-    def match_glossary(self, value, *args, **kwargs):
+            if sub_el in self._STR_SUBS:
+                parts.append(f"{tabs}.{sub_el}:\n")
+                parts.extend(f"{item_tabs}- {val}\n" for val in getattr(self, sub_el))
+            elif sub_el in self._XML_SUBS:
+                parts.append(f"{tabs}.{sub_el}:\n")
+                parts.extend(
+                    f"{item_tabs}- {val.as_text()}\n" for val in getattr(self, sub_el)
+                )
+
+    def match_glossary(
+        self, value: str, exact: bool = True, case_sensitive: bool = True
+    ) -> bool:
         """
         Match against glossary fields.
         """
         for glos in self.glossary:
-            if glos.match_value(value, *args, **kwargs):
+            if glos.match_value(value, exact, case_sensitive):
                 return True
         return False
 
-    def __repr__(self):
+    def __repr__(self) -> str:
         cls_name = type(self).__name__
         return f"<{cls_name} Glossary: {len(self.glossary)}>"
 
 
 class EntryElement(XmlElement):
-    tag = "entry"
-
-    def __init__(self, item: Tag = None):
-        self.sequence: int = None
-        self.kanji: List[KanjiElement] = []
-        self.reading: List[ReadingElement] = []
-        self.sense: List[SenseElement] = []
-        if item:
+    """
+    A JMDict entry. Only the sequence and the flat kanji/reading/glossary
+    values are read when the entry is built; the kanji, reading and sense
+    sub-elements are built from the kept lxml element on first access.
+    """
+
+    tag: ClassVar[str] = "entry"
+    __slots__ = (
+        "sequence",
+        "_tag",
+        "_kanji_cache",
+        "_reading_cache",
+        "_sense_cache",
+        "_kanji_values",
+        "_reading_values",
+        "_gloss_values",
+        "_kanji_low",
+        "_reading_low",
+        "_gloss_low",
+    )
+    # Everything but the lxml element, which can't be pickled. Spelled out
+    # since compiled (mypyc) classes don't keep `__slots__` around.
+    _STATE: ClassVar[Tuple[str, ...]] = (
+        "sequence",
+        "_kanji_cache",
+        "_reading_cache",
+        "_sense_cache",
+        "_kanji_values",
+        "_reading_values",
+        "_gloss_values",
+        "_kanji_low",
+        "_reading_low",
+        "_gloss_low",
+    )
+
+    def __init__(self, item: Optional[Element] = None) -> None:
+        self.sequence: Optional[int] = None
+        self._tag: Optional[Element] = None
+        self._kanji_cache: Optional[List[KanjiElement]] = None
+        self._reading_cache: Optional[List[ReadingElement]] = None
+        self._sense_cache: Optional[List[SenseElement]] = None
+        self._kanji_values: Tuple[str, ...] = ()
+        self._reading_values: Tuple[str, ...] = ()
+        self._gloss_values: Tuple[str, ...] = ()
+        self._kanji_low: Tuple[str, ...] = ()
+        self._reading_low: Tuple[str, ...] = ()
+        self._gloss_low: Tuple[str, ...] = ()
+        if item is not None:
             self.update(item)
 
-    @XmlElementDecorators.verify_tag
-    def update(self, item: Tag):
-        if item.ent_seq:
-            self.sequence = int(item.ent_seq.text)
-        for kanji in item.find_all(KanjiElement.tag):
-            self.kanji.append(KanjiElement(kanji))
-        for reading in item.find_all(ReadingElement.tag):
-            self.reading.append(ReadingElement(reading))
-        for sense in item.find_all(SenseElement.tag):
-            self.sense.append(SenseElement(sense))
-
-    def as_text(self):
-        result = io.StringIO()
-        result.write(f"Entry ({self.sequence}):\n")
-        result.write("\t> Kanji(s):\n")
-        for kanji in self.kanji:
-            result.write(f"\t\t- {kanji.as_text()}\n")
-        result.write("\n")
-
-        result.write("\t> Reading(s):\n")
-        for reading in self.reading:
-            result.write(f"\t\t- {reading.as_text()}\n")
-        result.write("\n")
-
-        result.write("\t> Sense(s):\n")
+    def update(self, item: Element) -> None:
+        if __debug__ and item.tag != self.tag:
+            raise ValueError(f"Tag name mismatched ({self.tag} != {item.tag})")
+        self._tag = item
+        self._kanji_cache = self._reading_cache = self._sense_cache = None
+        kanji: List[str] = []
+        reading: List[str] = []
+        glossary: List[str] = []
+        for child in item.iterchildren(tag=etree.Element):
+            if child.tag == SenseElement.tag:
+                glossary.extend(map(_text, child.iterchildren(GlossaryElement.tag)))
+            elif child.tag == ReadingElement.tag:
+                reading.extend(map(_text, child.iterchildren("reb")))
+            elif child.tag == KanjiElement.tag:
+                kanji.extend(map(_text, child.iterchildren("keb")))
+            elif child.tag == "ent_seq":
+                self.sequence = int(_text(child))
+        self._kanji_values = tuple(kanji)
+        self._reading_values = tuple(reading)
+        self._gloss_values = tuple(glossary)
+        self._kanji_low = tuple(map(_lower, kanji))
+        self._reading_low = tuple(map(_lower, reading))
+        self._gloss_low = tuple(map(_lower, glossary))
+
+    def _children(self, tag: str) -> Iterator[Element]:
+        if self._tag is None:
+            return iter(())
+        return self._tag.iterchildren(tag)
+
+    @property
+    def kanji(self) -> List[KanjiElement]:
+        if self._kanji_cache is None:
+            self._kanji_cache = [
+                KanjiElement(child) for child in self._children(KanjiElement.tag)
+            ]
+        return self._kanji_cache
+
+    @kanji.setter
+    def kanji(self, value: List[KanjiElement]) -> None:
+        self._kanji_cache = value
+
+    @property
+    def reading(self) -> List[ReadingElement]:
+        if self._reading_cache is None:
+            self._reading_cache = [
+                ReadingElement(child) for child in self._children(ReadingElement.tag)
+            ]
+        return self._reading_cache
+
+    @reading.setter
+    def reading(self, value: List[ReadingElement]) -> None:
+        self._reading_cache = value
+
+    @property
+    def sense(self) -> List[SenseElement]:
+        if self._sense_cache is None:
+            self._sense_cache = [
+                SenseElement(child) for child in self._children(SenseElement.tag)
+            ]
+        return self._sense_cache
+
+    @sense.setter
+    def sense(self, value: List[SenseElement]) -> None:
+        self._sense_cache = value
+
+    def materialize(self) -> "EntryElement":
+        """
+        Build every sub-element now and release the lxml element. The flat
+        values are then taken from the sub-elements, so both share the same
+        string objects.
+        """
+        kanji = [kanji for kanji in self.kanji if kanji.value is not None]
+        reading = [reading for reading in self.reading if reading.value is not None]
+        glossary = [
+            glos
+            for sense in self.sense
+            for glos in sense.glossary
+            if glos.value is not None
+        ]
+        self._kanji_values = tuple(el.value or "" for el in kanji)
+        self._reading_values = tuple(el.value or "" for el in reading)
+        self._gloss_values = tuple(el.value or "" for el in glossary)
+        self._kanji_low = tuple(el._value_lower or "" for el in kanji)
+        self._reading_low = tuple(el._value_lower or "" for el in reading)
+        self._gloss_low = tuple(el._value_lower or "" for el in glossary)
+        self._tag = None
+        return self
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # lxml elements can't be pickled, so the sub-elements are built instead
+        # and the element is released rather than kept alongside them.
+        self.materialize()
+        return {name: getattr(self, name) for name in self._STATE}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self._tag = None
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def as_text(self, parts: Optional[List[str]] = None) -> str:
+        """
+        Return the formatted entry. If `parts` is given, the lines are appended
+        to it and the whole list is joined.
+        """
+        if parts is None:
+            parts = []
+        self._write_text(parts)
+        return "".join(parts)
+
+    def _write_text(self, parts: List[str]) -> None:
+        parts.append(f"Entry ({self.sequence}):\n\t> Kanji(s):\n")
+        parts.extend(f"\t\t- {kanji.as_text()}\n" for kanji in self.kanji)
+        parts.append("\n\t> Reading(s):\n")
+        parts.extend(f"\t\t- {reading.as_text()}\n" for reading in self.reading)
+        parts.append("\n\t> Sense(s):\n")
         for i, sense in enumerate(self.sense):
-            result.write(f"\t--- {i+1} ---\n")
-            sense.as_text(
-                sub_elements=SenseElement.SUB_ELEMENTS, buffer=result, indent_level=2
-            )
-        return result.getvalue()
+            parts.append(f"\t--- {i+1} ---\n")
+            sense._write_text(parts, SenseElement.SUB_ELEMENTS, 2)
 
-    def match_kanji(self, value, *args, **kwargs):
+    def match_kanji(
+        self, value: str, exact: bool = True, case_sensitive: bool = True
+    ) -> bool:
         """
-        Match against glossary fields.
+        Match against kanji fields.
         """
-        for kanji in self.kanji:
-            if kanji.match_value(value, *args, **kwargs):
-                return True
-        return False
+        if case_sensitive:
+            return _match_any(self._kanji_values, value, exact)
+        return _match_any(self._kanji_low, value.lower(), exact)
 
-    def match_reading(self, value, *args, **kwargs):
+    def match_reading(
+        self, value: str, exact: bool = True, case_sensitive: bool = True
+    ) -> bool:
         """
-        Match against glossary fields.
+        Match against reading fields.
         """
-        for reading in self.reading:
-            if reading.match_value(value, *args, **kwargs):
-                return True
-        return False
+        if case_sensitive:
+            return _match_any(self._reading_values, value, exact)
+        return _match_any(self._reading_low, value.lower(), exact)
 
-    def match_glossary(self, value, *args, **kwargs):
+    def match_glossary(
+        self, value: str, exact: bool = True, case_sensitive: bool = True
+    ) -> bool:
         """
         Match against glossary fields.
         """
-        for sense in self.sense:
-            if sense.match_glossary(value, *args, **kwargs):
-                return True
-        return False
+        if case_sensitive:
+            return _match_any(self._gloss_values, value, exact)
+        return _match_any(self._gloss_low, value.lower(), exact)
 
     def match(
         self,
-        kanji: str = None,
-        reading: str = None,
-        glossary: str = None,
-    ):
+        kanji: Optional[str] = None,
+        reading: Optional[str] = None,
+        glossary: Optional[str] = None,
+    ) -> Any:
         if not (kanji or reading or glossary):
             return ValueError("Query input required.")
-        if kanji:
-            if self.match_kanji(kanji, exact=False, case_sensitive=False):
-                return True
-        if reading:
-            if self.match_reading(reading, exact=False, case_sensitive=False):
-                return True
-        if glossary:
-            if self.match_glossary(glossary, exact=False, case_sensitive=False):
-                return True
-        return False
+        return self._match_lowered(
+            kanji and kanji.lower(),
+            reading and reading.lower(),
+            glossary and glossary.lower(),
+        )
+
+    def _match_lowered(
+        self, kanji: Optional[str], reading: Optional[str], glossary: Optional[str]
+    ) -> bool:
+        """
+        Same as match(), but expects the query values to be lowercased already.
+        Fields are checked from the smallest (kanji) to the largest (glossary).
+        """
+        return bool(
+            (kanji and any(kanji in val for val in self._kanji_low))
+            or (reading and any(reading in val for val in self._reading_low))
+            or (glossary and any(glossary in val for val in self._gloss_low))
+        )
 
-    def __repr__(self):
+    def __repr__(self) -> str:
         cls_name = type(self).__name__
         return f"<{cls_name} Sequence: {self.sequence}, Kanji: {len(self.kanji)}, Reading: {len(self.reading)}, Sense: {len(self.sense)}>"
 
 
+def _parse_chunk(header: bytes, chunk: bytes, footer: bytes) -> List[EntryElement]:
+    """
+    Build the entries of a slice of a JMDict-XML. `header` and `footer` are the
+    bytes around the entries of the source file, so the DTD entities and the
+    root element are preserved.
+    """
+    parser = etree.XMLParser(resolve_entities=False)
+    root = etree.fromstring(header + chunk + footer, parser)
+    return [EntryElement(entry) for entry in root.iterchildren(EntryElement.tag)]
+
+
+def _split_entries(content: bytes, parts: int) -> Tuple[bytes, List[bytes], bytes]:
+    """
+    Split the entries of a JMDict-XML into (at most) `parts` chunks of roughly
+    equal size, cutting only at entry boundaries.
+    """
+    closing = b"</%s>" % EntryElement.tag.encode()
+    start = content.find(b"<%s>" % EntryElement.tag.encode())
+    end = content.rfind(closing)
+    if start < 0 or end < 0:
+        return content, [], b""
+    end += len(closing)
+    step = max((end - start) // parts, 1)
+    chunks: List[bytes] = []
+    offset = start
+    while offset < end:
+        cut = content.find(closing, max(offset, min(offset + step, end) - len(closing)))
+        cut = end if cut < 0 else cut + len(closing)
+        chunks.append(content[offset:cut])
+        offset = cut
+    return content[:start], chunks, content[end:]
+
+
 class JMDict(object):
     """
     JMDict-entries container. This class is analogous to Django's Queryset.
     """
 
-    tag: str = "jmdict"
+    tag: ClassVar[str] = "jmdict"
+
+    # JMDict.filter_any() field name -> lowercased values on EntryElement.
+    FIELD_VALUES: ClassVar[Dict[str, str]] = {
+        "kanji": "_kanji_low",
+        "reading": "_reading_low",
+        "glossary": "_gloss_low",
+    }
+    SEPARATOR: ClassVar[str] = "\x1f"
 
     @classmethod
-    def _read_xml_soup(cls, item: BeautifulSoup):
-        if item is None:
-            raise ValueError("Received None value as input.")
-        entries = []
-        for entry in item.find_all(EntryElement.tag):
-            entries.append(EntryElement(entry))
-        return entries
+    def _iter_entries(cls, xml_dir: str, clear: bool = True) -> Iterator[Element]:
+        """
+        Stream the entry elements of a JMDict-XML. With `clear`, each element
+        is cleared once the consumer moves on to the next one, so it must be
+        fully read before advancing the iterator.
+        """
+        for _, elem in etree.iterparse(
+            xml_dir, events=("end",), tag=EntryElement.tag, resolve_entities=False
+        ):
+            yield elem
+            if clear:
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+
+    @staticmethod
+    def _resolve_workers(workers: Optional[int]) -> int:
+        """
+        Return the number of processes to use; None (or 0) means every CPU,
+        and more processes than CPUs are never used.
+        """
+        cpus = os.cpu_count() or 1
+        return min(workers or cpus, cpus)
 
     @classmethod
-    def from_soup(cls, soup: BeautifulSoup):
-        entries = cls._read_xml_soup(soup)
-        return cls(entries)
+    def _read_parallel(
+        cls, xml_dir: str, workers: Optional[int] = None
+    ) -> List[EntryElement]:
+        """
+        Build the entries of a JMDict-XML in multiple processes. Unlike
+        _iter_entries(), the whole file is read into memory.
+        """
+        workers = cls._resolve_workers(workers)
+        with open(xml_dir, "rb") as xml:
+            header, chunks, footer = _split_entries(xml.read(), workers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                _parse_chunk,
+                itertools.repeat(header),
+                chunks,
+                itertools.repeat(footer),
+            )
+            return list(itertools.chain.from_iterable(results))
 
     @classmethod
-    def from_xml(cls, xml_dir: str):
+    def from_xml(
+        cls, xml_dir: str, workers: Optional[int] = 1, lazy: bool = False
+    ) -> "JMDict":
         """
         Create a JMDict instance by reading a JMDict-XML. This will load all
         entries inside the file.
+
+        By default the file is streamed in the current process, and each entry
+        is built and its lxml element released before the next one is read.
+        With `lazy`, each entry keeps its lxml element (and so the whole
+        document stays in memory) and builds its sub-elements on first access.
+        Set `workers` to the number of processes (or None for all CPUs) to
+        build the (non-lazy) entries in parallel instead; the entries are
+        unpickled back in this process one chunk after another, which limits
+        the speedup. With a single CPU the file is streamed as usual.
         """
-        with open(xml_dir, "r") as xml:
-            content = BeautifulSoup(xml, "lxml")
-            entries = cls._read_xml_soup(content.jmdict)
-            return cls(entries)
+        if cls._resolve_workers(workers) == 1:
+            entries = [
+                EntryElement(entry) if lazy else EntryElement(entry).materialize()
+                for entry in cls._iter_entries(xml_dir, clear=not lazy)
+            ]
+        else:
+            entries = cls._read_parallel(xml_dir, workers)
+        return cls(entries)
 
-    def __init__(self, entries: List[EntryElement] = []):
+    def __init__(self, entries: List[EntryElement] = []) -> None:
         self.entries: List[EntryElement] = entries
+        self._haystacks: Dict[str, Tuple[str, List[int], List[int]]] = {}
 
-    def __getitem__(self, item):
+    def __getitem__(self, item: Any) -> Any:
         return self.entries[item]
 
-    def as_text(self, start: int = None, end: int = None, buffer: io.StringIO = None):
+    def as_text(
+        self,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        parts: Optional[List[str]] = None,
+    ) -> str:
         """
-        Display entries contained in this instance as a formatted string.
+        Display entries contained in this instance as a formatted string. If
+        `parts` is given, the lines are appended to it and the whole list is
+        joined.
         """
         if (start is not None and start >= len(self.entries)) or (
             end is not None and end > len(self.entries)
         ):
             raise IndexError("Index out of range.")
 
-        if not buffer:
-            buffer = io.StringIO()
+        if parts is None:
+            parts = []
 
         if start is not None and end is not None:
             entries = self.entries[start:end]
@@ -451,40 +854,120 @@ class JMDict(object):
         else:
             entries = self.entries
         for entry in entries:
-            buffer.write(entry.as_text())
-        return buffer.getvalue()
+            entry._write_text(parts)
+        return "".join(parts)
 
-    def print_out(self, *args, **kwargs):
+    def print_out(self, *args: Any, **kwargs: Any) -> None:
         print(self.as_text(*args, **kwargs))
 
-    def count(self):
+    def count(self) -> int:
         return len(self.entries)
 
     def filter(
         self,
-        sequence: int = None,
-        kanji: str = None,
-        reading: str = None,
-        glossary: str = None,
-        limit: int = None,
-    ):
+        sequence: Optional[int] = None,
+        kanji: Optional[str] = None,
+        reading: Optional[str] = None,
+        glossary: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Any:
         """
         Filter entries contained in this instance and return them as a new
         JMDict instance.
         """
         if not (kanji or reading or glossary):
             return ValueError("Query input required.")
-        results = []
-        i = 0
         if limit is None or limit < 0:
             limit = len(self.entries)
-        while i < len(self.entries) and len(results) <= limit:
-            entry = self.entries[i]
-            if entry.match(kanji=kanji, reading=reading, glossary=glossary):
-                results.append(entry)
-            i += 1
-        return JMDict(results)
-
-    def __repr__(self):
+        kanji = kanji and kanji.lower()
+        reading = reading and reading.lower()
+        glossary = glossary and glossary.lower()
+        matches: List[EntryElement] = []
+        for entry in self.entries:
+            if len(matches) >= limit:
+                break
+            if entry._match_lowered(kanji, reading, glossary):
+                matches.append(entry)
+        return JMDict(matches)
+
+    def filter_any(
+        self,
+        kanji: Union[str, List[str], None] = None,
+        reading: Union[str, List[str], None] = None,
+        glossary: Union[str, List[str], None] = None,
+        limit: Optional[int] = None,
+    ) -> Any:
+        """
+        Same as filter(), but each field takes a list of values; an entry
+        matches if any of them (loosely) matches. A single string is taken as
+        a one-value list. Uses an Aho-Corasick automaton when pyahocorasick is
+        installed.
+        """
+        fields = {
+            field: self._needles(values)
+            for field, values in (
+                ("kanji", kanji),
+                ("reading", reading),
+                ("glossary", glossary),
+            )
+        }
+        if not any(fields.values()):
+            return ValueError("Query input required.")
+        matched: Set[int] = set()
+        for field, needles in fields.items():
+            if not needles:
+                continue
+            if ahocorasick is None:
+                matched.update(self._scan_field(field, needles))
+            else:
+                matched.update(self._search_field(field, needles))
+        if limit is None or limit < 0:
+            limit = len(matched)
+        indexes = itertools.islice(sorted(matched), limit)
+        return JMDict([self.entries[i] for i in indexes])
+
+    @staticmethod
+    def _needles(values: Union[str, List[str], None]) -> Set[str]:
+        if isinstance(values, str):
+            values = [values]
+        return {value.lower() for value in values or () if value}
+
+    def _scan_field(self, field: str, needles: Set[str]) -> Iterator[int]:
+        attr = self.FIELD_VALUES[field]
+        for i, entry in enumerate(self.entries):
+            if any(needle in val for val in getattr(entry, attr) for needle in needles):
+                yield i
+
+    def _search_field(self, field: str, needles: Set[str]) -> Iterator[int]:
+        automaton = ahocorasick.Automaton()
+        for needle in needles:
+            automaton.add_word(needle, needle)
+        automaton.make_automaton()
+        text, starts, owners = self._haystack(field)
+        for end, _ in automaton.iter(text):
+            yield owners[bisect.bisect_right(starts, end) - 1]
+
+    def _haystack(self, field: str) -> Tuple[str, List[int], List[int]]:
+        """
+        Return (and cache) the lowercased values of a field joined into one
+        string, with the start offset and entry index of every value. The
+        cache assumes `entries` is not modified afterwards.
+        """
+        if field not in self._haystacks:
+            attr = self.FIELD_VALUES[field]
+            values: List[str] = []
+            starts: List[int] = []
+            owners: List[int] = []
+            offset = 0
+            for i, entry in enumerate(self.entries):
+                for val in getattr(entry, attr):
+                    values.append(val)
+                    starts.append(offset)
+                    owners.append(i)
+                    offset += len(val) + len(self.SEPARATOR)
+            self._haystacks[field] = (self.SEPARATOR.join(values), starts, owners)
+        return self._haystacks[field]
+
+    def __repr__(self) -> str:
         cls_name = type(self).__name__
         return f"<{cls_name} Entries: {len(self.entries)}>"
@@ -23,6 +23,6 @@ setup(
     packages=['jmdict', 'jmdict.xml'],
     package_dir={"": "."},
     package_data={},
-    install_requires=['beautifulsoup4==4.*,>=4.9.3', 'lxml==4.*,>=4.6.1'],
+    install_requires=['lxml==4.*,>=4.6.1'],
     extras_require={"dev": ["black==20.*,>=20.8.0.b1"]},
 )